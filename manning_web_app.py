@@ -8,31 +8,54 @@ workbooks from staff scheduling spreadsheets. It supports multiple locations
 
 """
 
+import bisect
+import functools
+import gzip
+import hashlib
+import io
 import os
+import posixpath
 import re
+import shutil
 import sys
 import threading
 import logging
+import mmap
+import uuid
 import webbrowser
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
 
 from flask import (
     Flask,
     request,
     redirect,
     url_for,
-    render_template_string,
+    render_template,
     send_from_directory,
     abort,
     flash,
     get_flashed_messages,
+    make_response,
+    Response,
+    send_file,
+    session,
 )
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.serving import make_server
 
 try:
     import openpyxl
-    from openpyxl.styles import Font, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, Border, NamedStyle, Side
+    from openpyxl.styles.borders import DEFAULT_BORDER
+    from openpyxl.styles.fonts import DEFAULT_FONT
+    from openpyxl.utils import coordinate_to_tuple, get_column_letter, range_boundaries
+    from openpyxl.worksheet.worksheet import Worksheet
 except ImportError as exc:
     raise SystemExit(
         "Required dependency openpyxl is missing. Install with 'pip install openpyxl'."
@@ -55,17 +78,44 @@ BASE_DIR = EXEC_DIR
 INPUT_DIR = os.path.join(BASE_DIR, "input_my_staff_schedule")
 OUTPUT_DIR = os.path.join(BASE_DIR, "manning_sheets")
 LOG_DIR = os.path.join(BASE_DIR, "logs")
+LOG_FILE = os.path.join(LOG_DIR, "manning_app.log")
 STATIC_ROOT = os.path.join(RESOURCE_DIR, "static")
 if not os.path.isdir(STATIC_ROOT):
     STATIC_ROOT = os.path.join(BASE_DIR, "static")
+TEMPLATE_ROOT = os.path.join(RESOURCE_DIR, "templates")
+if not os.path.isdir(TEMPLATE_ROOT):
+    TEMPLATE_ROOT = os.path.join(BASE_DIR, "templates")
 
 # Ensure necessary directories exist
 os.makedirs(INPUT_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(LOG_DIR, exist_ok=True)
 
-# Track outputs generated during this runtime (latest batch only)
-CURRENT_OUTPUTS: List[str] = []
+# Application messages go to the log file shown on the log page and to the
+# console; per-request lines from werkzeug stay on the console only
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(message)s",
+    handlers=[logging.FileHandler(LOG_FILE, encoding="utf-8"), logging.StreamHandler()],
+)
+logging.getLogger("werkzeug").propagate = False
+
+# Track outputs generated during this runtime: the latest batch of each
+# browser session, oldest sessions dropped first beyond the cap
+CURRENT_OUTPUTS: Dict[str, List[str]] = {}
+OUTPUTS_LOCK = threading.Lock()
+MAX_TRACKED_SESSIONS = 256
+
+# Background chart generation; each job is keyed by an opaque id
+EXECUTOR = ThreadPoolExecutor(max_workers=2)
+JOBS: Dict[str, Tuple[Future, str]] = {}
+# Finished jobs are kept so their status page can be revisited, and are
+# dropped oldest first once this many jobs are tracked
+MAX_TRACKED_JOBS = 256
+# Rows shown per page of the history archive
+HISTORY_PAGE_SIZE = 50
+# Idle progress streams send a comment this often so proxies keep them open
+PROGRESS_HEARTBEAT_SECONDS = 15
 
 # Locations configuration
 LOCATIONS = {
@@ -76,17 +126,72 @@ LOCATIONS = {
 
 from mappings import SOUTHSIDE_MAPPING, IKES_MAPPING, SOUTHSIDE_KEYWORDS, IKES_KEYWORDS
 
+# Patterns used while parsing schedule exports, compiled once at import
+# An assignment is a name block (one or more non-blank lines, starting at
+# the top of the cell or after a blank line) followed by its time range
+_CELL_RE = re.compile(
+    r"^((?:[^\n]+\n)*?[^\n]+)\n+(\d{1,2}:\d{2}\s*\w{2})\s*-\s*(\d{1,2}:\d{2}\s*\w{2})",
+    re.MULTILINE,
+)
+_YEAR_RE = re.compile(r"\d{4}")
+_DATE_RE = re.compile(r"(\d{2}/\d{2})")
+
+
+def wrapped_line_count(line: str) -> int:
+    """Estimate how many rows a single line wraps to in a chart cell.
+
+    Columns are 30 wide; roughly 35 characters fit per wrapped row.
+    """
+    return 1 + max(0, (len(line) - 1) // 35)
+
+
+def split_blocks(text: str) -> List[str]:
+    """Split a schedule cell into its blank-line separated blocks.
+
+    Runs of two or more newlines count as a single separator; the returned
+    blocks are stripped and never empty.
+    """
+    parts = text.replace("\r\n", "\n").split("\n\n")
+    return [part.strip() for part in parts if part.strip()]
+
+
+def scan_cell_assignments(text: str) -> List[Tuple[str, str, str]]:
+    """Return ``(name, start, end)`` for each name block and time range in a cell.
+
+    Line endings are normalised first. Names keep all lines of their block;
+    stray text and a trailing name without a time range are skipped.
+    """
+    found = []
+    for m in _CELL_RE.finditer(text.replace("\r\n", "\n")):
+        name = m.group(1).strip()
+        if name:
+            found.append((name, m.group(2), m.group(3)))
+    return found
+
+
+@functools.lru_cache(maxsize=512)
 def parse_time(time_str: str) -> Optional[float]:
     """Convert a 12‑hour time string into a floating point hour.
 
     Example: "06:00 AM" -> 6.0, "02:30 PM" -> 14.5.
-    Returns None if parsing fails.
+    Returns None if parsing fails. Shift start times repeat constantly, so
+    results are memoized; callers pass the regex-captured text as the key.
     """
     time_str = time_str.strip()
-    match = re.match(r"(\d{1,2}):(\d{2})\s*(AM|PM)", time_str, re.IGNORECASE)
-    if not match:
+    idx = time_str.find(":")
+    if idx not in (1, 2):
+        return None
+    hour_text, minute_text = time_str[:idx], time_str[idx + 1:idx + 3]
+    meridiem = time_str[-2:].upper()
+    if (
+        not hour_text.isdecimal()
+        or len(minute_text) != 2
+        or not minute_text.isdecimal()
+        or meridiem not in ("AM", "PM")
+        or time_str[idx + 3:-2].strip()
+    ):
         return None
-    hour, minute, meridiem = int(match.group(1)), int(match.group(2)), match.group(3).upper()
+    hour, minute = int(hour_text), int(minute_text)
     if meridiem == "PM" and hour != 12:
         hour += 12
     if meridiem == "AM" and hour == 12:
@@ -94,6 +199,32 @@ def parse_time(time_str: str) -> Optional[float]:
     return hour + minute / 60.0
 
 
+# Manning Chart cell styles, shared by every generated sheet
+_TITLE_FONT = Font(size=14, bold=True)
+_HEADER_FONT = Font(bold=True)
+_ALIGN_CENTER = Alignment(horizontal='center', vertical='center')
+_ALIGN_CENTER_WRAP = Alignment(horizontal='center', vertical='center', wrap_text=True)
+_ALIGN_LEFT_CENTER = Alignment(horizontal='left', vertical='center')
+_ALIGN_LEFT_TOP = Alignment(horizontal='left', vertical='top', wrap_text=True)
+_THIN = Side(border_style='thin', color='000000')
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+# Named styles registered on every generated workbook, so each cell carries
+# a single style reference instead of separate font/alignment/border records
+_CHART_STYLES = {
+    "mc_title": dict(font=_TITLE_FONT, alignment=_ALIGN_CENTER, border=DEFAULT_BORDER),
+    "mc_meta": dict(font=DEFAULT_FONT, alignment=_ALIGN_LEFT_CENTER, border=DEFAULT_BORDER),
+    "mc_header": dict(font=_HEADER_FONT, alignment=_ALIGN_CENTER_WRAP, border=_BORDER),
+    "mc_cell": dict(font=DEFAULT_FONT, alignment=_ALIGN_LEFT_TOP, border=_BORDER),
+}
+
+
+def register_chart_styles(wb: "openpyxl.Workbook") -> None:
+    """Add the Manning Chart named styles to a workbook."""
+    for name, attrs in _CHART_STYLES.items():
+        wb.add_named_style(NamedStyle(name=name, **attrs))
+
+
 # Additional mappings not in the Excel file
 FALLBACK_MAPPINGS = {
     "am pasta": "LITTLE ITALY",
@@ -108,9 +239,8 @@ IGNORED_ROLES = {
 def validate_file_location(file_path: str, location: str) -> bool:
     """Validate that the uploaded file matches the expected location."""
     try:
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        ws = wb.active
-        header_val = str(ws['A1'].value or "")
+        # Only A1 is needed: read it straight from the zip parts
+        header_val = str(read_xlsx_a1(file_path) or "")
         
         if location == "ikes":
             return "GMU DH-Ike" in header_val
@@ -123,49 +253,65 @@ def validate_file_location(file_path: str, location: str) -> bool:
         return False
 
 
+# Per-location lookup tables: (exact role -> station, ordered keyword rules).
+# Fallback mappings only fill gaps; the generated mapping always wins.
+_CATEGORY_TABLES: Dict[str, Tuple[Dict[str, str], Tuple[Tuple[str, str], ...]]] = {
+    "southside": (
+        {**FALLBACK_MAPPINGS, **SOUTHSIDE_MAPPING},
+        tuple((keyword.lower(), station) for keyword, station in SOUTHSIDE_KEYWORDS),
+    ),
+    "ikes": (
+        dict(IKES_MAPPING),
+        tuple((keyword.lower(), station) for keyword, station in IKES_KEYWORDS),
+    ),
+}
+
+
+@functools.lru_cache(maxsize=512)
 def get_category(role: str, location: str) -> Optional[str]:
     """Map a job role to a Manning Chart category (station) based on location.
     
     1. Exact match (case-insensitive) against dictionary.
     2. Fallback exact matches.
     3. Fuzzy keyword match.
+
+    Role labels repeat heavily across rows, so results are memoized on the
+    raw label and again on its normalised form (see _lookup_category).
     """
     if not role:
         return None
-    role_clean = role.strip().replace("\n", "").strip()
-    role_lower = role_clean.lower()
+    # Dropping newlines before a single strip() yields the same key as
+    # strip/replace/strip, with one fewer intermediate string
+    return _lookup_category(role.replace("\n", "").strip().lower(), location)
 
-    if location == "southside":
-        # 1. Exact lookup
-        if role_lower in SOUTHSIDE_MAPPING:
-            return SOUTHSIDE_MAPPING[role_lower]
-        if role_lower in FALLBACK_MAPPINGS:
-            return FALLBACK_MAPPINGS[role_lower]
-            
-        # 2. Fuzzy/Keyword lookup
-        for keyword, station in SOUTHSIDE_KEYWORDS:
-            if keyword in role_lower:
-                return station
-                
+
+@functools.lru_cache(maxsize=4096)
+def _lookup_category(role_lower: str, location: str) -> Optional[str]:
+    """Resolve a normalised role label against the location's tables."""
+    tables = _CATEGORY_TABLES.get(location)
+    if tables is None:
         return None
+    exact, keywords = tables
 
-    elif location == "ikes":
-        # 1. Exact lookup
-        if role_lower in IKES_MAPPING:
-            return IKES_MAPPING[role_lower]
-            
-        # 2. Fuzzy/Keyword lookup
-        for keyword, station in IKES_KEYWORDS:
-            if keyword in role_lower:
-                return station
+    # 1./2. Exact lookup (fallbacks are merged into the same table)
+    if role_lower in exact:
+        return exact[role_lower]
+
+    # 3. Fuzzy/Keyword lookup
+    for keyword, station in keywords:
+        if keyword in role_lower:
+            return station
 
-        return None
-    
     return None
 
 
-def get_stations_layout(location: str) -> List[List[str]]:
-    """Return the grid layout of stations for the Manning Sheet."""
+@functools.lru_cache(maxsize=None)
+def get_stations_layout(location: str) -> Tuple[Tuple[str, ...], ...]:
+    """Return the grid layout of stations for the Manning Sheet.
+
+    The layout is a pure function of the static mappings, so it is built
+    once per location and shared as immutable tuples.
+    """
     if location == "southside":
         # 5-column layout for Southside
         known_stations = sorted(list(set(SOUTHSIDE_MAPPING.values())))
@@ -176,12 +322,12 @@ def get_stations_layout(location: str) -> List[List[str]]:
         rows = []
         chunk_size = 5
         for i in range(0, len(known_stations), chunk_size):
-            rows.append(known_stations[i:i + chunk_size])
+            rows.append(tuple(known_stations[i:i + chunk_size]))
         
         if not rows:
-            rows = [['NO STATIONS MAPPED']]
+            rows = [('NO STATIONS MAPPED',)]
             
-        return rows
+        return tuple(rows)
 
     else:
         # Ikes Layout - Dynamic
@@ -192,12 +338,23 @@ def get_stations_layout(location: str) -> List[List[str]]:
         rows = []
         chunk_size = 5
         for i in range(0, len(known_stations), chunk_size):
-            rows.append(known_stations[i:i + chunk_size])
+            rows.append(tuple(known_stations[i:i + chunk_size]))
 
         if not rows:
-             rows = [['NO STATIONS MAPPED']]
+             rows = [('NO STATIONS MAPPED',)]
+
+        return tuple(rows)
+
+
+@functools.lru_cache(maxsize=None)
+def get_layout_index(location: str) -> Dict[str, int]:
+    """Map every station with a slot in the location's layout to its position.
 
-        return rows
+    Positions follow the layout read row by row, so they double as indexes
+    into the flat per-shift bucket lists built by process_schedule_file.
+    """
+    layout = get_stations_layout(location)
+    return {category: idx for idx, category in enumerate(c for group in layout for c in group)}
 
 
 def process_schedule_file(file_path: str, output_dir: str, location: str = "ikes") -> List[str]:
@@ -207,23 +364,31 @@ def process_schedule_file(file_path: str, output_dir: str, location: str = "ikes
     """
     outputs: List[str] = []
     try:
-        wb = openpyxl.load_workbook(file_path, data_only=True)
+        wb = openpyxl.load_workbook(file_path, data_only=True, read_only=True)
     except Exception as exc:
         logging.error(f"Error opening '{file_path}': {exc}")
         return outputs
 
-    ws = wb.active
-    header_cell_value = ws['A1'].value or ""
-    year_matches = re.findall(r"\d{4}", str(header_cell_value))
+    # Read-only worksheets stream the sheet XML, so read every row in a
+    # single forward pass and release the archive handle straight away.
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        first_row = next(rows, None) or (None,)
+        header_row = next(rows, None) or ()
+        data_rows = list(rows)
+    finally:
+        wb.close()
+
+    header_cell_value = first_row[0] or ""
+    year_matches = _YEAR_RE.findall(str(header_cell_value))
     year = year_matches[-1] if year_matches else ""
 
-    header_row = [cell for cell in ws.iter_rows(min_row=2, max_row=2, values_only=True)][0]
     date_columns: List[int] = []
     date_labels: List[str] = []
     for idx, cell in enumerate(header_row):
         if idx == 0 or not cell:
             continue
-        m = re.search(r"(\d{2}/\d{2})", str(cell))
+        m = _DATE_RE.search(str(cell))
         if m:
             date_columns.append(idx)
             label = m.group(1)
@@ -248,182 +413,182 @@ def process_schedule_file(file_path: str, output_dir: str, location: str = "ikes
             {'name': '10pm-5am', 'meal_periods': 'OVNT', 'lower': 22.0, 'upper': 24.0}, 
         ]
 
+    # Shift bounds for start-time bucketing (shifts are sorted by start)
+    shift_lowers = [shift['lower'] for shift in shifts]
+    shift_uppers = [shift['upper'] for shift in shifts]
+
     # Chart row layout
     row_groups = get_stations_layout(location)
     location_name = LOCATIONS.get(location, {}).get("name", location.title())
 
     generation_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    # For each date, produce a workbook
-    for file_counter, (col_idx, date_label) in enumerate(zip(date_columns, date_labels), start=1):
-        try:
-            parsed_date = datetime.strptime(date_label, "%m/%d/%Y")
-            weekday_label = f" ({parsed_date.strftime('%A')})"
-            date_part = parsed_date.strftime("%a_%d_%b")
-        except ValueError:
-            parsed_date = None
-            weekday_label = ""
-            date_part = date_label.replace('/', '-').replace('-', '_')
-        
-        shift_data = [
-            {category: [] for group in row_groups for category in group}
-            for _ in shifts
-        ]
-        
-        # Metrics for verification
-        total_assignments_found = 0
-        mapped_assignments_found = 0
-        unmapped_roles_list = set()
+    # Sheet width is driven by the widest station row (at least 3 columns)
+    max_cols = max(len(grp) for grp in row_groups) if row_groups else 1
+    if max_cols < 3: max_cols = 3
+    end_col_letter = get_column_letter(max_cols)
+    layout_index = get_layout_index(location)
+    n_categories = len(layout_index)
+
+    # Per-date accumulators, filled in a single sweep over the schedule rows.
+    # Only categories present in the layout are ever appended to.
+    # Buckets are indexed [shift][layout position] (see get_layout_index).
+    shift_data_per_date = [
+        [[[] for _ in range(n_categories)] for _ in shifts] for _ in date_columns
+    ]
+    # Wrapped line totals per bucket, kept alongside the entries so the
+    # row-height estimate does not re-split the joined cell text
+    shift_lines_per_date = [[[0] * n_categories for _ in shifts] for _ in date_columns]
+    # Metrics for verification
+    total_per_date = [0] * len(date_columns)
+    mapped_per_date = [0] * len(date_columns)
+    unmapped_per_date: List[set] = [set() for _ in date_columns]
+    layout_misses_per_date: List[List[str]] = [[] for _ in date_columns]
+
+    for row in data_rows:
+        if not row:
+            continue
+        role = row[0]
+        # Normalised once per row: the same key get_category would build
+        role_str = str(role)
+        role_norm = role_str.replace("\n", "").strip().lower()
+
+        # Ignored roles never count towards (or against) the totals
+        if role_norm in IGNORED_ROLES:
+            continue
 
-        for row in ws.iter_rows(min_row=3, values_only=True):
-            role = row[0]
+        # Role resolution only depends on the row, not on the date column
+        category = _lookup_category(role_norm, location) if role_str else None
+        category_idx = layout_index.get(category)
+
+        for date_idx, col_idx in enumerate(date_columns):
+            # Unsized exports (no <dimension> tag) yield ragged rows
+            if col_idx >= len(row):
+                break
             cell_val = row[col_idx]
             if not cell_val:
                 continue
-            
-            category = get_category(str(role), location)
-            
-            # Count potential assignments in this cell
+
+            shift_data = shift_data_per_date[date_idx]
+            shift_lines = shift_lines_per_date[date_idx]
+
+            # Each assignment is a name block followed by its time range;
+            # one scan picks out every pair and skips stray text between them
             cell_str = str(cell_val).strip()
-            assignments = [s for s in re.split(r"\n{2,}", cell_str) if s.strip()]
             
             # Temporary list to hold valid assignments found in this cell
             valid_assignments_in_cell = []
 
-            i = 0
-            while i < len(assignments):
-                if i + 1 < len(assignments):
-                    name = assignments[i].strip()
-                    time_range = assignments[i + 1].strip()
-                    i += 2
-                else:
-                    break
-                m = re.match(
-                    r"(\d{1,2}:\d{2}\s*\w{2})\s*-\s*(\d{1,2}:\d{2}\s*\w{2})",
-                    time_range,
-                )
-                if not m:
-                    continue
-                
+            for name, start_str, end_str in scan_cell_assignments(cell_str):
                 # Check if valid time parse
-                start_time = parse_time(m.group(1))
+                start_time = parse_time(start_str)
                 if start_time is None:
                     continue
-                
-                # Check if role is ignored
-                if str(role).strip().replace("\n", "").strip().lower() in IGNORED_ROLES:
-                    continue
 
-                total_assignments_found += 1
-                valid_assignments_in_cell.append((name, m, start_time))
+                total_per_date[date_idx] += 1
+                valid_assignments_in_cell.append((name, f"{start_str} - {end_str}", start_time))
 
             if not category:
                 # If role is not mapped, all assignments in this cell are unmapped
                 if valid_assignments_in_cell:
-                    unmapped_roles_list.add(str(role))
+                    unmapped_per_date[date_idx].add(role_str)
                 continue
             
             # Ensure category exists in layout
-            found_layout = False
-            for grp in row_groups:
-                if category in grp:
-                    found_layout = True
-                    break
-            
-            if not found_layout:
+            if category_idx is None:
                 if valid_assignments_in_cell:
-                    logging.warning(f"Role '{role}' mapped to '{category}' which is not in the layout.")
+                    layout_misses_per_date[date_idx].append(
+                        f"Role '{role}' mapped to '{category}' which is not in the layout."
+                    )
                 continue
 
             # Process valid assignments
-            for name, m, start_time in valid_assignments_in_cell:
+            for name, time_text, start_time in valid_assignments_in_cell:
                 # Assign to shift based on start time
-                shift_index = -1
-                
                 if location == 'southside':
-                    # Simple range check
-                    for idx, s in enumerate(shifts):
-                        if s['lower'] <= start_time < s['upper']:
-                            shift_index = idx
-                            break
-                        # Handle potential edge case where 11:30pm might be exactly 23.5
+                    # Shifts are contiguous and ordered: the first upper
+                    # bound above the start time picks the candidate shift
+                    shift_index = bisect.bisect_right(shift_uppers, start_time)
+                    if shift_index == len(shifts) or start_time < shift_lowers[shift_index]:
+                        shift_index = -1
                 else:
-                    # Ikes logic (legacy behavior preservation)
-                    if 5 <= start_time < 14:
-                        shift_index = 0
-                    elif 14 <= start_time < 22:
-                        shift_index = 1
-                    else:
-                        shift_index = 2
+                    # Ikes logic (legacy behavior preservation): anything
+                    # outside the day and evening shifts is overnight
+                    shift_index = 0 if 5 <= start_time < 14 else (1 if 14 <= start_time < 22 else 2)
 
                 if shift_index != -1:
-                    # check if category in that shift's dict (it should be initialized for all)
-                    if category in shift_data[shift_index]:
-                        entry = f"{name}\n{m.group(1)} - {m.group(2)}"
-                        shift_data[shift_index][category].append(entry)
-                        mapped_assignments_found += 1
-        
-        logging.info(f"Verification for {date_label}: Found {total_assignments_found} assignments. Mapped {mapped_assignments_found}.")
-        if unmapped_roles_list:
-            logging.warning(f"Unmapped roles with assignments: {list(unmapped_roles_list)}")
-        if total_assignments_found != mapped_assignments_found:
-             logging.warning(f"Mismatch in assignment counts! Missing {total_assignments_found - mapped_assignments_found} assignments.")
-
-        # Create output workbook
-        out_wb = openpyxl.Workbook()
-        out_wb.remove(out_wb.active)
+                    entry = f"{name}\n{time_text}"
+                    shift_data[shift_index][category_idx].append(entry)
+                    shift_lines[shift_index][category_idx] += sum(
+                        wrapped_line_count(line) for line in entry.split("\n")
+                    )
+                    mapped_per_date[date_idx] += 1
+
+    def write_workbook(
+        out_path: str,
+        date_label: str,
+        weekday_label: str,
+        shift_data: List[List[List[str]]],
+        shift_lines: List[List[int]],
+    ) -> None:
+        """Build one date's chart workbook and save it to ``out_path``."""
+        # Create output workbook. Write-only sheets stream rows straight to
+        # XML, so column widths, row heights and print settings must be in
+        # place before the corresponding rows are appended.
+        out_wb = openpyxl.Workbook(write_only=True)
+        register_chart_styles(out_wb)
         for idx_shift, shift_info in enumerate(shifts):
             sheet = out_wb.create_sheet(shift_info['name'])
-            # Calculate max columns dynamically
-            max_cols = max(len(grp) for grp in row_groups) if row_groups else 1
-            if max_cols < 3: max_cols = 3 
-            
-            from openpyxl.utils import get_column_letter
-            end_col_letter = get_column_letter(max_cols)
 
-            sheet.merge_cells(f'A1:{end_col_letter}1')
-            sheet['A1'] = f'MANNING CHART - {location_name.upper()}'
-            sheet['A1'].font = Font(size=14, bold=True)
-            sheet['A1'].alignment = Alignment(horizontal='center', vertical='center')
-            
-            sheet.merge_cells(f'A2:{end_col_letter}2')
-            sheet['A2'] = f"Date: {date_label}{weekday_label}    Meal Periods: {shift_info['meal_periods']}    MOD:"
-            sheet['A2'].alignment = Alignment(horizontal='left', vertical='center')
-            
             for c_idx in range(1, max_cols + 1):
                 sheet.column_dimensions[get_column_letter(c_idx)].width = 30
-            
-            thin = Side(border_style='thin', color='000000')
-            border = Border(left=thin, right=thin, top=thin, bottom=thin)
-            
+
+            # Print Settings
+            sheet.page_setup.orientation = Worksheet.ORIENTATION_LANDSCAPE
+            sheet.page_setup.paperSize = Worksheet.PAPERSIZE_LETTER
+            sheet.page_setup.fitToPage = True
+            sheet.page_setup.fitToHeight = 1
+            sheet.page_setup.fitToWidth = 1
+
+            title_cell = WriteOnlyCell(sheet, value=f'MANNING CHART - {location_name.upper()}')
+            title_cell.style = "mc_title"
+            sheet.append([title_cell])
+            sheet.merged_cells.add(f'A1:{end_col_letter}1')
+
+            meta_cell = WriteOnlyCell(
+                sheet,
+                value=f"Date: {date_label}{weekday_label}    Meal Periods: {shift_info['meal_periods']}    MOD:",
+            )
+            meta_cell.style = "mc_meta"
+            sheet.append([meta_cell])
+            sheet.merged_cells.add(f'A2:{end_col_letter}2')
+
             row_ptr = 3
             for group in row_groups:
-                for col, label in enumerate(group, start=1):
-                    hcell = sheet.cell(row=row_ptr, column=col)
-                    hcell.value = label
-                    hcell.font = Font(bold=True)
-                    hcell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                    hcell.border = border
-                
+                header_cells = []
+                for label in group:
+                    hcell = WriteOnlyCell(sheet, value=label)
+                    hcell.style = "mc_header"
+                    header_cells.append(hcell)
+
                 data_row = row_ptr + 1
-                
+
                 max_lines = 1
-                for col, label in enumerate(group, start=1):
-                    dcell = sheet.cell(row=data_row, column=col)
-                    items = shift_data[idx_shift].get(label, [])
+                data_cells = []
+                for label in group:
+                    items = shift_data[idx_shift][layout_index[label]]
                     cell_text = '\n\n'.join(items) if items else ''
-                    dcell.value = cell_text
-                    dcell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-                    dcell.border = border
-                    
-                    # Calculate lines for this cell
-                    # We estimate lines based on newlines and roughly 30 chars per line (column width 30)
-                    lines_in_text = cell_text.split('\n')
-                    estimated_lines = 0
-                    for line in lines_in_text:
-                        # Simple wrap estimation: 1 + length // 35
-                        estimated_lines += 1 + max(0, (len(line) - 1) // 35)
-                    
+                    dcell = WriteOnlyCell(sheet, value=cell_text)
+                    dcell.style = "mc_cell"
+                    data_cells.append(dcell)
+
+                    # Calculate lines for this cell: the entries' own wrapped
+                    # lines plus one blank separator line between entries
+                    if items:
+                        estimated_lines = shift_lines[idx_shift][layout_index[label]] + len(items) - 1
+                    else:
+                        estimated_lines = 1
+
                     if estimated_lines > max_lines:
                         max_lines = estimated_lines
 
@@ -431,20 +596,58 @@ def process_schedule_file(file_path: str, output_dir: str, location: str = "ikes
                 # Base height approx 15pts per line, minimum 60
                 new_height = max(60, max_lines * 15)
                 sheet.row_dimensions[data_row].height = new_height
-                
+
+                sheet.append(header_cells)
+                sheet.append(data_cells)
                 row_ptr += 2
 
-            # Print Settings
-            sheet.page_setup.orientation = sheet.ORIENTATION_LANDSCAPE
-            sheet.page_setup.paperSize = sheet.PAPERSIZE_LETTER
-            sheet.page_setup.fitToPage = True
-            sheet.page_setup.fitToHeight = 1
-            sheet.page_setup.fitToWidth = 1
-                
-        out_filename = f"{date_part}_{location_name}_Manning_sheet_{generation_stamp}.xlsx"
-        out_path = os.path.join(output_dir, out_filename)
+        # Serialise in memory and move the finished file into place, so
+        # the history listing never picks up a half-written workbook
+        buffer = io.BytesIO()
+        out_wb.save(buffer)
+        tmp_path = out_path + ".tmp"
+        with open(tmp_path, "wb") as out_file:
+            out_file.write(buffer.getbuffer())
+        os.replace(tmp_path, out_path)
+
+    # For each date, produce a workbook. Dates share no mutable state, so
+    # their workbooks are built and saved concurrently, each on its own
+    # Workbook; logging and output order stay on this thread.
+    pending: List[Tuple[str, Future]] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(os.cpu_count() or 1, len(date_labels)))) as pool:
+        for date_idx, date_label in enumerate(date_labels):
+            try:
+                parsed_date = datetime.strptime(date_label, "%m/%d/%Y")
+                weekday_label = f" ({parsed_date.strftime('%A')})"
+                date_part = parsed_date.strftime("%a_%d_%b")
+            except ValueError:
+                parsed_date = None
+                weekday_label = ""
+                date_part = date_label.replace('/', '-').replace('-', '_')
+
+            shift_data = shift_data_per_date[date_idx]
+            total_assignments_found = total_per_date[date_idx]
+            mapped_assignments_found = mapped_per_date[date_idx]
+            unmapped_roles_list = unmapped_per_date[date_idx]
+
+            for message in layout_misses_per_date[date_idx]:
+                logging.warning(message)
+            logging.info(f"Verification for {date_label}: Found {total_assignments_found} assignments. Mapped {mapped_assignments_found}.")
+            if unmapped_roles_list:
+                logging.warning(f"Unmapped roles with assignments: {list(unmapped_roles_list)}")
+            if total_assignments_found != mapped_assignments_found:
+                 logging.warning(f"Mismatch in assignment counts! Missing {total_assignments_found - mapped_assignments_found} assignments.")
+
+            out_filename = f"{date_part}_{location_name}_Manning_sheet_{generation_stamp}.xlsx"
+            out_path = os.path.join(output_dir, out_filename)
+            pending.append((out_filename, pool.submit(
+                write_workbook, out_path, date_label, weekday_label, shift_data,
+                shift_lines_per_date[date_idx],
+            )))
+
+    for out_filename, future in pending:
         try:
-            out_wb.save(out_path)
+            future.result()
             outputs.append(out_filename)
             logging.info(f"Generated '{out_filename}' from '{os.path.basename(file_path)}'.")
         except Exception as exc:
@@ -452,119 +655,338 @@ def process_schedule_file(file_path: str, output_dir: str, location: str = "ikes
     return outputs
 
 
+#########################
+# Workbook value reader #
+#########################
+
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _xlsx_text(node: Optional[ET.Element]) -> Optional[str]:
+    """Concatenate the plain and rich-text runs of a string item."""
+    if node is None:
+        return None
+    parts = []
+    plain = node.find(f"{_SHEET_NS}t")
+    if plain is not None and plain.text:
+        parts.append(plain.text)
+    for run in node.iterfind(f"{_SHEET_NS}r/{_SHEET_NS}t"):
+        if run.text:
+            parts.append(run.text)
+    return "".join(parts)
+
+
+def _xlsx_part(target: str, base: str = "xl") -> str:
+    """Resolve a relationship target, relative to ``base``, to an archive member name."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(base, target))
+
+
+def _xlsx_shared_strings(
+    archive: zipfile.ZipFile, member: Optional[str], limit: Optional[int] = None
+) -> List[str]:
+    """Load the shared string table, if the workbook has one.
+
+    With ``limit`` set, parsing stops once that many strings have been read.
+    """
+    strings: List[str] = []
+    if member is None or member not in archive.namelist():
+        return strings
+    with archive.open(member) as src:
+        for _, node in ET.iterparse(src):
+            if node.tag == f"{_SHEET_NS}si":
+                strings.append(_xlsx_text(node).replace("x005F_", ""))
+                node.clear()
+                if limit is not None and len(strings) >= limit:
+                    break
+    return strings
+
+
+def _xlsx_cell_value(cell: ET.Element, shared_strings: List[str]) -> Any:
+    """Decode a <c> element the way openpyxl does for data_only reads (no dates)."""
+    data_type = cell.get("t", "n")
+    if data_type == "inlineStr":
+        return _xlsx_text(cell.find(f"{_SHEET_NS}is"))
+    raw = cell.findtext(f"{_SHEET_NS}v") or None
+    if raw is None:
+        return None
+    if data_type == "n":
+        return float(raw) if ("." in raw or "E" in raw or "e" in raw) else int(raw)
+    if data_type == "s":
+        return shared_strings[int(raw)]
+    if data_type == "b":
+        return bool(int(raw))
+    return raw
+
+
+def _xlsx_sheet_rows(
+    archive: zipfile.ZipFile,
+    member: str,
+    shared_strings: List[str],
+    max_rows: Optional[int] = None,
+    max_cols: Optional[int] = None,
+) -> List[Tuple[Any, ...]]:
+    """Read a worksheet into value tuples padded to the sheet width.
+
+    Mirrors openpyxl's read-only ``iter_rows(values_only=True)``: rows start
+    at A1, missing rows come back empty, and unsized sheets are measured.
+    ``max_rows``/``max_cols`` stop the read at that many rows and columns.
+    """
+    cells_by_row: Dict[int, Dict[int, Any]] = {}
+    dimension: Optional[Tuple[int, int, int, int]] = None
+    row_idx = col_idx = max_col = 0
+    with archive.open(member) as src:
+        for event, node in ET.iterparse(src, events=("start", "end")):
+            tag = node.tag
+            if event == "start":
+                if tag == f"{_SHEET_NS}row":
+                    row_idx = int(node.get("r", row_idx + 1))
+                    # Rows are stored in order, so nothing later is wanted
+                    if max_rows is not None and row_idx > max_rows:
+                        break
+                    col_idx = 0
+                    cells_by_row.setdefault(row_idx, {})
+                elif tag == f"{_SHEET_NS}dimension":
+                    dimension = range_boundaries(node.get("ref"))
+                continue
+            if tag == f"{_SHEET_NS}c":
+                coordinate = node.get("r")
+                col_idx = coordinate_to_tuple(coordinate)[1] if coordinate else col_idx + 1
+                if max_cols is None or col_idx <= max_cols:
+                    max_col = max(max_col, col_idx)
+                    cells_by_row[row_idx][col_idx] = _xlsx_cell_value(node, shared_strings)
+                node.clear()
+            elif tag == f"{_SHEET_NS}row":
+                node.clear()
+
+    last_row = max(cells_by_row, default=0)
+    if dimension is not None and all(dimension):
+        max_col = dimension[2] if max_cols is None else min(dimension[2], max_cols)
+        last_row = min(last_row, dimension[3])
+
+    rows: List[Tuple[Any, ...]] = []
+    for idx in range(1, last_row + 1):
+        values = [None] * max_col
+        for col, value in cells_by_row.get(idx, {}).items():
+            if col <= max_col:
+                values[col - 1] = value
+        rows.append(tuple(values))
+    return rows
+
+
+def _xlsx_workbook_parts(
+    archive: zipfile.ZipFile,
+) -> Tuple[List[Tuple[str, Optional[str]]], Optional[str], int]:
+    """Return ``(sheets, shared_strings_member, active_index)`` for a workbook.
+
+    ``sheets`` lists ``(title, member)`` pairs in workbook order, with a
+    ``None`` member for chartsheets and other non-worksheets so that
+    ``active_index`` (the workbook's activeTab) indexes it directly.
+    """
+    # The workbook part is whatever the package's officeDocument points at
+    workbook_member = "xl/workbook.xml"
+    package_rels = ET.fromstring(archive.read("_rels/.rels"))
+    for rel in package_rels.iterfind(f"{_PKG_REL_NS}Relationship"):
+        if rel.get("Type", "").endswith("/officeDocument"):
+            workbook_member = _xlsx_part(rel.get("Target"), "")
+            break
+    base, name = posixpath.split(workbook_member)
+
+    rels = ET.fromstring(archive.read(posixpath.join(base, "_rels", f"{name}.rels")))
+    worksheets: Dict[str, str] = {}
+    shared_member = None
+    for rel in rels.iterfind(f"{_PKG_REL_NS}Relationship"):
+        rel_type = rel.get("Type", "")
+        if rel_type.endswith("/worksheet"):
+            worksheets[rel.get("Id")] = _xlsx_part(rel.get("Target"), base)
+        elif rel_type.endswith("/sharedStrings"):
+            shared_member = _xlsx_part(rel.get("Target"), base)
+
+    workbook = ET.fromstring(archive.read(workbook_member))
+    sheets = [
+        (sheet.get("name"), worksheets.get(sheet.get(f"{_DOC_REL_NS}id")))
+        for sheet in workbook.iterfind(f"{_SHEET_NS}sheets/{_SHEET_NS}sheet")
+    ]
+    view = workbook.find(f"{_SHEET_NS}bookViews/{_SHEET_NS}workbookView")
+    active = int(view.get("activeTab", 0)) if view is not None else 0
+    return sheets, shared_member, active
+
+
+def read_xlsx_values(
+    file_path: str, max_rows: Optional[int] = None, max_cols: Optional[int] = None
+) -> List[Tuple[str, List[Tuple[Any, ...]]]]:
+    """Return ``(title, rows)`` for each worksheet of an .xlsx file.
+
+    Only cell values are read straight from the zip parts; styles, themes
+    and defined names are never parsed, which keeps previews cheap. The
+    optional limits bound how much of each sheet is read.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        members, shared_member, _ = _xlsx_workbook_parts(archive)
+        shared_strings = _xlsx_shared_strings(archive, shared_member)
+        return [
+            (title, _xlsx_sheet_rows(archive, member, shared_strings, max_rows, max_cols))
+            for title, member in members
+            if member is not None
+        ]
+
+
+def read_xlsx_a1(file_path: str) -> Any:
+    """Return the value of cell A1 on the active worksheet.
+
+    The sheet is streamed only until its first row ends, and shared strings
+    are read only up to the index A1 refers to.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        members, shared_member, active = _xlsx_workbook_parts(archive)
+        if not members:
+            return None
+        _, member = members[active] if active < len(members) else members[0]
+        if member is None:
+            # The active sheet is a chartsheet, which has no cells
+            return None
+
+        a1 = None
+        with archive.open(member) as src:
+            for event, node in ET.iterparse(src, events=("start", "end")):
+                if event == "start":
+                    # Rows are written in order, so anything past row 1 means A1 is empty
+                    if node.tag == f"{_SHEET_NS}row" and node.get("r", "1") != "1":
+                        break
+                    continue
+                if node.tag == f"{_SHEET_NS}c":
+                    if node.get("r", "A1") == "A1":
+                        a1 = node
+                    break
+                if node.tag == f"{_SHEET_NS}row":
+                    break
+        if a1 is None:
+            return None
+
+        shared_strings: List[str] = []
+        if a1.get("t") == "s":
+            index = int(a1.findtext(f"{_SHEET_NS}v") or 0)
+            shared_strings = _xlsx_shared_strings(archive, shared_member, limit=index + 1)
+            if index >= len(shared_strings):
+                return None
+        return _xlsx_cell_value(a1, shared_strings)
+
+
 ######################
 # Flask web server   #
 ######################
 
-app = Flask(__name__, static_folder=STATIC_ROOT, static_url_path="/static")
+app = Flask(
+    __name__,
+    static_folder=STATIC_ROOT,
+    static_url_path="/static",
+    template_folder=TEMPLATE_ROOT,
+)
 app.secret_key = os.environ.get("MANNING_APP_SECRET", "manning-standalone-secret")
 
-
-BASE_CSS = """
-/* UI styling lives in static/assets/css. Inline rules reserved for quick overrides. */
-.location-toggle {
-    margin-bottom: 30px;
-    display: flex;
-    justify-content: center;
-    gap: 0;
-}
-.location-toggle .btn {
-    min-width: 160px;
-    border-radius: 0;
-    border: 1px solid rgba(255,255,255,0.1);
-}
-.location-toggle .btn:first-child {
-    border-top-left-radius: 30px;
-    border-bottom-left-radius: 30px;
-}
-.location-toggle .btn:last-child {
-    border-top-right-radius: 30px;
-    border-bottom-right-radius: 30px;
-}
-.location-toggle .btn-secondary {
-    background: transparent;
-    color: rgba(255,255,255,0.7);
-}
-.location-toggle .btn-primary {
-    background: #e14eca;
-    background-image: linear-gradient(to bottom left, #e14eca, #ba54f5, #e14eca);
-    background-size: 210% 210%;
-    background-position: top right;
-    border-color: transparent;
-    box-shadow: 0px 0px 20px 0px rgba(186, 84, 245, 0.5);
-}
-/* Toast Notifications */
-.toast-container {
-    position: fixed;
-    top: 20px;
-    right: 20px;
-    z-index: 10000;
-    display: flex;
-    flex-direction: column;
-    gap: 10px;
-}
-.toast-notification {
-    min-width: 300px;
-    background: #2b3553;
-    color: #ffffff;
-    padding: 15px 20px;
-    border-radius: 5px;
-    box-shadow: 0 4px 6px rgba(0,0,0,0.3);
-    border-left: 5px solid #e14eca;
-    display: flex;
-    align-items: center;
-    justify-content: space-between;
-    opacity: 0;
-    transform: translateX(50px);
-    animation: slideIn 0.3s forwards;
-    transition: opacity 0.3s ease, transform 0.3s ease;
-}
-.toast-notification.success {
-    border-left-color: #00f2c3; /* Green/Teal for success */
-}
-.toast-notification.error {
-    border-left-color: #fd5d93; /* Red/Pink for error */
-}
-.toast-notification .close-btn {
-    background: none;
-    border: none;
-    color: rgba(255,255,255,0.6);
-    cursor: pointer;
-    font-size: 1.2rem;
-    line-height: 1;
-    margin-left: 10px;
-}
-.toast-notification .close-btn:hover {
-    color: #fff;
-}
-@keyframes slideIn {
-    to {
-        opacity: 1;
-        transform: translateX(0);
-    }
-}
-.toast-notification.hide {
-    opacity: 0;
-    transform: translateX(50px);
+# Templates never change while the app is running; skip the per-fetch
+# source stat. Read when jinja_env is first created.
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+
+# Compiled template bytecode is cached across restarts (per-user directory
+# under the system temp dir). Passed as an option rather than set on
+# app.jinja_env so the environment is only built when a page first renders.
+app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache()}
+
+# MyStaff exports are a few MB at most; reject anything far larger up front
+app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+STATIC_ASSETS = {
+    "css_black": "assets/css/black-dashboard.min.css",
+    "css_custom": "assets/css/custom.css",
+    "css_icons": "assets/css/nucleo-icons.css",
+    "css_base": "assets/css/base.css",
+    "js_jquery": "assets/js/core/jquery.min.js",
+    "js_popper": "assets/js/core/popper.min.js",
+    "js_bootstrap": "assets/js/core/bootstrap.min.js",
+    "js_black": "assets/js/black-dashboard.min.js",
+    "js_viewer": "assets/js/viewer.js",
 }
-"""
+_ASSET_VERSIONS: Dict[str, str] = {}
+
+
+def asset_version(filename: str) -> str:
+    """Return a cache-busting token derived from a static file's mtime and size."""
+    version = _ASSET_VERSIONS.get(filename)
+    if version is None:
+        try:
+            st = os.stat(os.path.join(STATIC_ROOT, filename))
+            version = f"{int(st.st_mtime)}{st.st_size:x}"
+        except OSError:
+            version = "0"
+        _ASSET_VERSIONS[filename] = version
+    return version
 
 
 def asset_urls() -> Dict[str, str]:
-    """Return URLs for local CSS/JS assets served from /static."""
-    import time
-    v = int(time.time())
+    """Return URLs for local CSS/JS assets served from /static.
+
+    The URLs only vary with the mount point, so they are built once per
+    script root and reused; treat the returned dict as read-only.
+    """
+    return _asset_urls_for(request.script_root)
+
+
+@functools.lru_cache(maxsize=8)
+def _asset_urls_for(script_root: str) -> Dict[str, str]:
     return {
-        "css_black": url_for("static", filename="assets/css/black-dashboard.min.css") + f"?v={v}",
-        "css_custom": url_for("static", filename="assets/css/custom.css") + f"?v={v}",
-        "css_icons": url_for("static", filename="assets/css/nucleo-icons.css") + f"?v={v}",
-        "js_jquery": url_for("static", filename="assets/js/core/jquery.min.js") + f"?v={v}",
-        "js_popper": url_for("static", filename="assets/js/core/popper.min.js") + f"?v={v}",
-        "js_bootstrap": url_for("static", filename="assets/js/core/bootstrap.min.js") + f"?v={v}",
-        "js_black": url_for("static", filename="assets/js/black-dashboard.min.js") + f"?v={v}",
+        key: url_for("static", filename=filename) + f"?v={asset_version(filename)}"
+        for key, filename in STATIC_ASSETS.items()
     }
 
 
+@app.after_request
+def cache_static_assets(response):
+    """Let browsers keep versioned static assets for a year without revalidating."""
+    if request.path.startswith(app.static_url_path + "/") and "v" in request.args:
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+COMPRESS_MIMETYPES = {"text/html", "text/css", "text/plain", "application/javascript"}
+COMPRESS_MIN_SIZE = 1024
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip text responses for clients that accept it.
+
+    File responses (static assets, the full raw log) and streamed bodies are
+    passed through untouched. Entity tags are weakened since the encoded
+    body is a different representation.
+    """
+    response.vary.add("Accept-Encoding")
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESS_MIMETYPES
+        or "gzip" not in request.accept_encodings
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
 def parse_cell_assignments(cell_value: Optional[str]) -> List[Dict[str, str]]:
     """Split a cell value into individual staff assignments."""
     if not cell_value:
@@ -572,7 +994,7 @@ def parse_cell_assignments(cell_value: Optional[str]) -> List[Dict[str, str]]:
     text = str(cell_value).strip()
     if not text:
         return []
-    blocks = [block.strip() for block in re.split(r"\n{2,}", text) if block.strip()]
+    blocks = split_blocks(text)
     assignments: List[Dict[str, str]] = []
     for block in blocks:
         lines = [line.strip() for line in block.splitlines() if line.strip()]
@@ -584,18 +1006,25 @@ def parse_cell_assignments(cell_value: Optional[str]) -> List[Dict[str, str]]:
     return assignments
 
 
-def build_sheet_structure(ws: "openpyxl.worksheet.worksheet.Worksheet") -> Dict[str, Any]:
-    """Create a structured representation of a worksheet's staffing data."""
-    rows = list(ws.iter_rows(values_only=True))
+def build_sheet_structure(sheet_rows: Iterable[Tuple[Any, ...]]) -> Dict[str, Any]:
+    """Create a structured representation of a worksheet's staffing data.
+
+    ``sheet_rows`` are value tuples padded to the sheet width (see
+    read_xlsx_values); they are consumed as a single forward stream.
+    """
+    rows = iter(sheet_rows)
     stations: List[Dict[str, Any]] = []
     excel_sections: List[Dict[str, List[str]]] = []
-    
-    row_idx = 2  # first two rows are header/meta rows
-    
-    while row_idx < len(rows):
-        header_row = rows[row_idx]
-        data_row = rows[row_idx + 1] if row_idx + 1 < len(rows) else None
-        
+
+    # first two rows are header/meta rows; A2 carries the date/meal metadata
+    next(rows, None)
+    meta_row = next(rows, None)
+    header_meta = meta_row[0] if meta_row and meta_row[0] else ""
+
+    header_row = next(rows, None)
+    while header_row is not None:
+        data_row = next(rows, None)
+
         if header_row and data_row is not None:
              # Find how many columns have content in header
             col_count = len(header_row)
@@ -624,24 +1053,91 @@ def build_sheet_structure(ws: "openpyxl.worksheet.worksheet.Worksheet") -> Dict[
 
             if has_content:
                 excel_sections.append({"headers": headers, "cells": cells})
-                row_idx += 2
+                header_row = next(rows, None)
                 continue
-        
-        row_idx += 1
+
+        # Not a header/data pair; retry with the following row as header
+        header_row = data_row
             
     total_entries = sum(len(station["entries"]) for station in stations)
-    return {"stations": stations, "total_entries": total_entries, "excel_sections": excel_sections}
+    return {
+        "stations": stations,
+        "total_entries": total_entries,
+        "excel_sections": excel_sections,
+        "header_metadata": header_meta,
+    }
+
+
+_OUTPUT_CACHE: Dict[str, Any] = {"mtime": None, "files": [], "by_location": {}}
+_OUTPUT_CACHE_LOCK = threading.Lock()
+
+
+def partition_by_location(files: Iterable[str]) -> Dict[str, List[str]]:
+    """Split output filenames into per-location lists in a single pass.
+
+    Generated names embed the location ("{date}_{location}_Manning_sheet_...").
+    Anything that is not explicitly Southside is treated as Ikes, which also
+    covers legacy files written before the location was part of the name.
+    """
+    partitions: Dict[str, List[str]] = {"ikes": [], "southside": []}
+    for name in files:
+        southside = "_Southside_" in name
+        if southside:
+            partitions["southside"].append(name)
+        if not southside or "_Ikes_" in name:
+            partitions["ikes"].append(name)
+    return partitions
+
+
+def _refresh_output_cache() -> None:
+    """Rescan the output directory if its mtime changed (caller holds the lock)."""
+    mtime = os.stat(OUTPUT_DIR).st_mtime_ns
+    if _OUTPUT_CACHE["mtime"] != mtime:
+        # Newest first; DirEntry.stat() reuses what the scan already fetched
+        # where the platform provides it (Windows), and ties fall back to name
+        with os.scandir(OUTPUT_DIR) as entries:
+            found = [
+                (-e.stat().st_mtime_ns, e.name)
+                for e in entries
+                if e.name.lower().endswith('.xlsx') and e.is_file()
+            ]
+        found.sort()
+        files = [name for _, name in found]
+        _OUTPUT_CACHE["mtime"] = mtime
+        _OUTPUT_CACHE["files"] = files
+        _OUTPUT_CACHE["by_location"] = partition_by_location(files)
+
+
+def invalidate_output_cache() -> None:
+    """Force the next listing to rescan the output directory.
+
+    Called after new outputs are written: directory mtimes are coarse on
+    some filesystems, so two batches in quick succession could otherwise
+    leave the cached listing stale.
+    """
+    with _OUTPUT_CACHE_LOCK:
+        _OUTPUT_CACHE["mtime"] = None
 
 
 def list_output_files() -> List[str]:
-    """Return a sorted list of .xlsx files in the output directory."""
-    files = [f for f in os.listdir(OUTPUT_DIR) if f.lower().endswith('.xlsx')]
-    files.sort()
-    return files
+    """Return the .xlsx files in the output directory, newest first.
+
+    The listing is rescanned only when the directory's mtime changes.
+    """
+    with _OUTPUT_CACHE_LOCK:
+        _refresh_output_cache()
+        return list(_OUTPUT_CACHE["files"])
+
+
+def list_output_files_for(location: str) -> List[str]:
+    """Return the output files belonging to ``location``, newest first."""
+    with _OUTPUT_CACHE_LOCK:
+        _refresh_output_cache()
+        return list(_OUTPUT_CACHE["by_location"][location])
 
 
 @app.route('/', methods=['GET'])
-def index() -> str:
+def index():
     """Render the upload form and list existing outputs."""
     view_mode = request.args.get("view", "current")
     location = request.args.get("location", "ikes") # Default to Ikes
@@ -650,264 +1146,148 @@ def index() -> str:
     if location not in LOCATIONS:
         location = "ikes"
     
+    sid = session.get("sid")
     show_history = view_mode == "history"
-    all_files = list_output_files() if show_history else CURRENT_OUTPUTS.copy()
-    
-    # Filter files by location
-    if location == "southside":
-        files = [f for f in all_files if "_Southside_" in f]
+    page = total_pages = 1
+    if show_history:
+        files = list_output_files_for(location)
+        # The archive only grows; render it one bounded page at a time
+        total_pages = max(1, -(-len(files) // HISTORY_PAGE_SIZE))
+        page = min(max(request.args.get("page", 1, type=int), 1), total_pages)
+        files = files[(page - 1) * HISTORY_PAGE_SIZE:page * HISTORY_PAGE_SIZE]
     else:
-        # Ikes files might explicitly say Ikes or might be legacy (no location name?)
-        # Current logic adds location_name to filename: "{date_part}_{location_name}_Manning_sheet..."
-        # So Ikes files should have "_Ikes_".
-        files = [f for f in all_files if "_Ikes_" in f or ("_Southside_" not in f)]
+        with OUTPUTS_LOCK:
+            current_outputs = list(CURRENT_OUTPUTS.get(sid, ()))
+        files = partition_by_location(current_outputs)[location]
     
-    total_generated = len(CURRENT_OUTPUTS)
-    latest_file = CURRENT_OUTPUTS[-1] if CURRENT_OUTPUTS else None
-    assets = asset_urls()
+    with OUTPUTS_LOCK:
+        batch = CURRENT_OUTPUTS.get(sid, ())
+        total_generated = len(batch)
+        latest_file = batch[-1] if batch else None
     flashes = get_flashed_messages(with_categories=True)
-    
+    if flashes:
+        # One-off messages: always render fresh and never cache
+        html = render_index(
+            location, view_mode, tuple(files), total_generated, latest_file,
+            page, total_pages, flashes=tuple(flashes),
+        )
+        response = make_response(html)
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    # Everything else on the page is determined by these inputs and the
+    # versioned asset URLs it links to
+    page_key = (location, view_mode, tuple(files), total_generated, latest_file, page, total_pages)
+    etag = hashlib.sha1(repr((page_key, asset_urls())).encode("utf-8")).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(render_index_cached(*page_key))
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def render_index(
+    location: str,
+    view_mode: str,
+    files: Tuple[str, ...],
+    total_generated: int,
+    latest_file: Optional[str],
+    page: int = 1,
+    total_pages: int = 1,
+    flashes: Tuple[Tuple[str, str], ...] = (),
+) -> str:
+    """Render the index page HTML."""
     location_name = LOCATIONS[location]["name"]
     title = f"Manning Sheets {location_name}"
-
-    return render_template_string(
-        """
-<!doctype html>
-<html lang="en">
-<head>
-    <meta charset="utf-8">
-    <title>{{ title }}</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1, shrink-to-fit=no">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="{{ css_black }}">
-    <link rel="stylesheet" href="{{ css_custom }}">
-    <link rel="stylesheet" href="{{ css_icons }}">
-    <style>{{ base_css }}</style>
-</head>
-<body class="app-shell">
-<div class="app-surface">
-    <!-- Toast Container -->
-    <div class="toast-container">
-        {% for category, message in flashes %}
-        <div class="toast-notification {{ category }}">
-            <span>{{ message }}</span>
-            <button class="close-btn" onclick="this.parentElement.classList.add('hide'); setTimeout(() => this.parentElement.remove(), 300);">&times;</button>
-        </div>
-        {% endfor %}
-    </div>
-    <!-- Sidebar Navigation -->
-    <nav class="app-sidebar">
-        <div class="brand">
-            <i class="tim-icons icon-chart-pie-36"></i> ManningGen
-        </div>
-        <p class="muted mb-4">Staffing automation for<br><strong>{{ location_name }}</strong></p>
-        
-        <div class="location-nav">
-            <p class="nav-label">Select Location</p>
-            <a href="{{ url_for('index', location='ikes', view=view_mode) }}" class="nav-item {{ 'active' if location == 'ikes' else '' }}">
-                <i class="tim-icons icon-istanbul"></i> Ikes Dining
-            </a>
-            <a href="{{ url_for('index', location='southside', view=view_mode) }}" class="nav-item {{ 'active' if location == 'southside' else '' }}">
-                <i class="tim-icons icon-bank"></i> Southside
-            </a>
-        </div>
-
-        <div class="sidebar-footer mt-auto">
-             <p class="small text-muted text-center">v2.2 Nano Banana</p>
-        </div>
-    </nav>
-
-    <!-- Main Content -->
-    <main class="app-content">
-        <div class="container-fluid p-0">
-            <!-- Header Row -->
-            <div class="row mb-4 align-items-center">
-                <div class="col-12">
-                     <h2 class="page-title">{{ title }}</h2>
-                     <p class="text-muted">Generate compliant manning charts from MyStaff schedules.</p>
-                </div>
-            </div>
-
-            <div class="row g-4 mb-5">
-                <!-- Usage Instructions Card -->
-                <div class="col-12 col-xl-5">
-                    <div class="app-card h-100">
-                        <h4 class="mb-3">Instructions</h4>
-                        <ol class="instruction-list ps-3">
-                            <li class="mb-2">Visit <strong>MyStaff</strong> and select the weekly schedule and click on print.</li>
-                            <li class="mb-2">Switch view to <strong>Task</strong> (top right corner).</li>
-                            <li class="mb-2">Click on <strong>Print</strong> (or the Excel export button) to download the file.</li>
-                            <li class="mb-2">Upload the file here and click <strong>Generate Charts</strong>.</li>
-                            <li>Your charts will appear below.</li>
-                        </ol>
-                    </div>
-                </div>
-
-                <!-- Upload Card -->
-                <div class="col-12 col-xl-7">
-                     <div class="app-card h-100 hero-gradient">
-                        <div class="d-flex align-items-center justify-content-between mb-4">
-                            <div>
-                                <h3 class="mb-1 text-white">Create New Manning Sheets</h3>
-                                <p class="opacity-75 mb-0">Upload MyStaff export (.xlsx)</p>
-                            </div>
-                            <div class="icon-shape bg-white text-primary rounded-circle shadow-sm d-flex align-items-center justify-content-center" style="width: 40px; height: 40px;">
-                                <i class="tim-icons icon-cloud-upload-94" style="font-size: 1.2rem;"></i>
-                            </div>
-                        </div>
-                          
-                        <form action="{{ url_for('upload') }}" method="post" enctype="multipart/form-data" class="upload-form">
-                            <input type="hidden" name="location" value="{{ location }}">
-                            <div class="file-drop-area w-100 mb-3">
-                                <span class="choose-file-btn mb-2">Choose File</span>
-                                <span class="file-msg small text-white-50">or drag and drop file here</span>
-                                <input class="file-input" type="file" name="file" accept=".xlsx" required>
-                            </div>
-                            <button type="submit" class="btn btn-white w-100 btn-lg fw-bold">Generate Charts &rarr;</button>
-                        </form>
-                     </div>
-                </div>
-            </div>
-
-            <!-- Stats Row -->
-            <div class="row g-4 mb-4">
-                 <div class="col-6 col-md-3">
-                    <div class="app-card text-center p-3">
-                        <h2 class="mb-0 text-primary">{{ total_generated }}</h2>
-                        <small class="text-muted text-uppercase">Total Charts</small>
-                    </div>
-                 </div>
-                 <div class="col-6 col-md-9">
-                    <div class="app-card p-3 d-flex align-items-center justify-content-between position-relative overflow-hidden">
-                        <div style="min-width: 0;">
-                             <small class="text-muted text-uppercase d-block">Latest Workbook</small>
-                             <span class="text-white text-truncate d-block" style="max-width: 100%;">{{ latest_file or "No files yet" }}</span>
-                        </div>
-                        <div class="icon-shape bg-primary text-white rounded-circle shadow-sm flex-shrink-0 ms-3 d-flex align-items-center justify-content-center" style="width:40px;height:40px;">
-                            <i class="tim-icons icon-calendar-60" style="font-size: 1rem;"></i>
-                        </div>
-                    </div>
-                 </div>
-            </div>
-
-            <!-- History Section -->
-            <div class="row">
-                <div class="col-12">
-                    <div class="app-card">
-                        <div class="d-flex justify-content-between align-items-center mb-4 flex-wrap gap-2">
-                             <h4 class="mb-0">{{ "History Archive" if show_history else "Recent Sessions" }}</h4>
-                             <div class="btn-group">
-                                 <a href="{{ url_for('index', view='current', location=location) }}" class="btn btn-sm btn-{{ 'primary' if not show_history else 'simple' }}">Current</a>
-                                 <a href="{{ url_for('index', view='history', location=location) }}" class="btn btn-sm btn-{{ 'primary' if show_history else 'simple' }}">History</a>
-                             </div>
-                        </div>
-                        
-                        {% if files %}
-                        <div class="table-responsive">
-                            <table class="table tablesorter align-middle" id="">
-                                <thead class="text-primary">
-                                    <tr>
-                                        <th>Generated File</th>
-                                        <th class="text-right">Actions</th>
-                                    </tr>
-                                </thead>
-                                <tbody>
-                                    {% for fname in files %}
-                                    <tr>
-                                        <td>
-                                            <div class="d-flex align-items-center gap-2">
-                                                <i class="tim-icons icon-single-copy-04 text-muted"></i>
-                                                <span class="fw-bold">{{ fname }}</span>
-                                            </div>
-                                        </td>
-                                        <td class="text-right">
-                                            <div class="btn-group">
-                                                <a href="{{ url_for('view_file', filename=fname) }}" class="btn btn-sm btn-info">
-                                                    <i class="tim-icons icon-zoom-split"></i> View
-                                                </a>
-                                                <a href="{{ url_for('download_file', filename=fname) }}" class="btn btn-sm btn-success">
-                                                    <i class="tim-icons icon-cloud-download-93"></i> Download
-                                                </a>
-                                                <a href="{{ url_for('view_file', filename=fname) }}?print=true" target="_blank" class="btn btn-sm btn-warning">
-                                                    <i class="tim-icons icon-print"></i> Print
-                                                </a>
-                                            </div>
-                                        </td>
-                                    </tr>
-                                    {% endfor %}
-                                </tbody>
-                            </table>
-                        </div>
-                        {% else %}
-                        <div class="text-center py-5">
-                            <h5 class="text-muted">No charts found</h5>
-                        </div>
-                        {% endif %}
-                    </div>
-                </div>
-            </div>
-            
-        </div>
-    </main>
-</div>
-
-<script src="{{ js_jquery }}"></script>
-<script src="{{ js_popper }}"></script>
-<script src="{{ js_bootstrap }}"></script>
-<script src="{{ js_black }}"></script>
-<script>
-    $('.file-input').on('change', function() {
-      var filesCount = $(this)[0].files.length;
-      var textContainer = $(this).prev();
-      if (filesCount === 1) {
-        textContainer.text($(this).val().split('\\\\').pop());
-      } else {
-        textContainer.text('or drag and drop file here');
-      }
-    });
-</script>
-</body>
-</html>
-        """,
-        files=files,
+    assets = asset_urls()
+    # Each row links to its file twice (view and print), so build the URLs once
+    rows = [
+        {
+            "name": fname,
+            "view": url_for('view_file', filename=fname),
+            "download": url_for('download_file', filename=fname),
+        }
+        for fname in files
+    ]
+    return render_template(
+        "index.html",
+        rows=rows,
         total_generated=total_generated,
         latest_file=latest_file,
-        base_css=BASE_CSS,
-        flashes=flashes,
-        show_history=show_history,
+        flashes=list(flashes),
+        show_history=view_mode == "history",
         title=title,
         location=location,
         location_name=location_name,
         view_mode=view_mode,
+        page=page,
+        total_pages=total_pages,
         **assets,
     )
 
 
-@app.route('/upload', methods=['POST'])
-def upload() -> str:
-    """Handle file upload, save to input directory, process it, and redirect."""
-    global CURRENT_OUTPUTS
-    
-    location = request.form.get("location", "ikes")
-    
-    if 'file' not in request.files:
-        flash("No file selected.", "error")
-        return redirect(url_for('index', location=location))
-    
-    file = request.files['file']
-    if file.filename == '':
+# Pages without flash messages only change when their inputs do
+render_index_cached = functools.lru_cache(maxsize=32)(render_index)
+
+
+def session_id() -> str:
+    """Return the browser session's id, assigning one on first use."""
+    sid = session.get("sid")
+    if sid is None:
+        sid = uuid.uuid4().hex
+        session["sid"] = sid
+    return sid
+
+
+def generate_charts(input_path: str, location: str, sid: str) -> List[str]:
+    """Process an uploaded schedule and publish the outputs as the session's latest batch."""
+    safe_filename = os.path.basename(input_path)
+    outputs = process_schedule_file(input_path, OUTPUT_DIR, location=location)
+    if outputs:
+        invalidate_output_cache()
+        logging.info(f"Generated {len(outputs)} output file(s) from '{safe_filename}'.")
+        with OUTPUTS_LOCK:
+            # Re-insert so the dict stays ordered by last update
+            CURRENT_OUTPUTS.pop(sid, None)
+            CURRENT_OUTPUTS[sid] = outputs
+            while len(CURRENT_OUTPUTS) > MAX_TRACKED_SESSIONS:
+                CURRENT_OUTPUTS.pop(next(iter(CURRENT_OUTPUTS)))
+    else:
+        logging.warning(f"No output files generated from '{safe_filename}'.")
+    return outputs
+
+
+def render_job_status(job_id: str, location: str) -> Tuple[str, int]:
+    """Render the auto-refreshing page shown while a job is still running."""
+    location_name = LOCATIONS.get(location, {}).get("name", location)
+    html = render_template(
+        "status.html",
+        status_url=url_for('job_status', job_id=job_id),
+        progress_url=url_for('job_progress', job_id=job_id),
+        location_name=location_name,
+    )
+    return html, 202
+
+
+def receive_schedule(source, filename: str, location: str) -> Optional[str]:
+    """Save an uploaded schedule, validate it and queue it for processing.
+
+    Returns the job id, or ``None`` after flashing why the file was refused.
+    """
+    if filename == '':
         flash("Please choose a file before uploading.", "error")
-        return redirect(url_for('index', location=location))
-    if not file.filename.lower().endswith('.xlsx'):
+        return None
+    if not filename.lower().endswith('.xlsx'):
         flash("Only .xlsx files are supported. Upload the MyStaff shift schedule exported in Task Wise view (.xlsx).", "error")
-        return redirect(url_for('index', location=location))
+        return None
     # Save the uploaded file with a timestamp to avoid collisions
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_filename = f"{timestamp}_{os.path.basename(file.filename)}"
+    safe_filename = f"{timestamp}_{os.path.basename(filename)}"
     input_path = os.path.join(INPUT_DIR, safe_filename)
-    file.save(input_path)
+    with open(input_path, "wb") as dest:
+        shutil.copyfileobj(source, dest, length=UPLOAD_CHUNK_SIZE)
     logging.info(f"Uploaded schedule saved to '{input_path}'.")
     
     # Validate location
@@ -920,267 +1300,259 @@ def upload() -> str:
             
         location_name = LOCATIONS.get(location, {}).get("name", location)
         flash(f'Please upload "{location_name}" schedule by following the instructions', "error")
+        return None
+
+    # Process the uploaded schedule off the request thread
+    job_id = uuid.uuid4().hex
+    JOBS[job_id] = (EXECUTOR.submit(generate_charts, input_path, location, session_id()), location)
+    if len(JOBS) > MAX_TRACKED_JOBS:
+        finished = [key for key, (future, _) in list(JOBS.items()) if future.done()]
+        for key in finished[:len(JOBS) - MAX_TRACKED_JOBS]:
+            JOBS.pop(key, None)
+    return job_id
+
+
+@app.route('/upload', methods=['POST'])
+def upload():
+    """Handle a multipart form upload and queue it for processing."""
+    location = request.form.get("location", "ikes")
+    
+    if 'file' not in request.files:
+        flash("No file selected.", "error")
         return redirect(url_for('index', location=location))
+    
+    file = request.files['file']
+    job_id = receive_schedule(file.stream, file.filename, location)
+    if job_id is None:
+        return redirect(url_for('index', location=location))
+    return render_job_status(job_id, location)
 
-    # Process the uploaded schedule
-    outputs = process_schedule_file(input_path, OUTPUT_DIR, location=location)
+
+@app.route('/upload_stream', methods=['POST'])
+def upload_stream():
+    """Handle a raw-body upload sent by the page's fetch uploader.
+
+    The request body is the file itself, copied straight to disk without
+    multipart parsing. The name comes from the URL-encoded ``X-Filename``
+    header. The response body is the URL the page should open next.
+    """
+    location = request.args.get("location", "ikes")
+    index_url = url_for('index', location=location)
+    limit = app.config['MAX_CONTENT_LENGTH']
+    if request.content_length is not None and request.content_length > limit:
+        flash(f"That file is too large. Uploads are limited to {limit // (1024 * 1024)} MB.", "error")
+        return Response(index_url, 413, mimetype="text/plain")
+
+    filename = unquote(request.headers.get("X-Filename", ""))
+    job_id = receive_schedule(request.stream, filename, location)
+    if job_id is None:
+        return Response(index_url, 400, mimetype="text/plain")
+    return Response(url_for('job_status', job_id=job_id), 202, mimetype="text/plain")
+
+
+@app.errorhandler(413)
+def upload_too_large(exc):
+    """Send oversized uploads back to the form with a readable message."""
+    limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    flash(f"That file is too large. Uploads are limited to {limit_mb} MB.", "error")
+    index_url = url_for('index', location=request.args.get("location", "ikes"))
+    if request.endpoint == 'upload_stream':
+        # The fetch uploader expects the next URL as plain text, not a redirect
+        return Response(index_url, 413, mimetype="text/plain")
+    return redirect(index_url)
+
+
+@app.route('/status/<job_id>')
+def job_status(job_id: str):
+    """Report on a queued job, redirecting to the index once it has finished."""
+    job = JOBS.get(job_id)
+    if job is None:
+        flash("That upload is no longer tracked. Any charts it produced are listed below.", "error")
+        return redirect(url_for('index'))
+    future, location = job
+    if not future.done():
+        return render_job_status(job_id, location)
+
+    try:
+        outputs = future.result()
+    except Exception as exc:
+        logging.error(f"Error processing schedule: {exc}")
+        outputs = []
     if outputs:
-        logging.info(f"Generated {len(outputs)} output file(s) from '{safe_filename}'.")
-        CURRENT_OUTPUTS = outputs
         flash(f"Successfully generated {len(outputs)} chart(s).", "success")
     else:
-        logging.warning(f"No output files generated from '{safe_filename}'.")
         flash("Unable to process that file. Upload the MyStaff shift schedule exported in Task Wise view (.xlsx) and try again.", "error")
-    # Redirect to index to show new files
     return redirect(url_for('index', location=location))
 
 
+@app.route('/progress/<job_id>')
+def job_progress(job_id: str):
+    """Stream a server-sent event once a queued job has finished.
+
+    The status page listens here instead of polling; the event only says
+    the job is done, the status route still reports the outcome.
+    """
+    job = JOBS.get(job_id)
+    if job is None:
+        return abort(404)
+    future = job[0]
+
+    def events():
+        while not wait([future], timeout=PROGRESS_HEARTBEAT_SECONDS).done:
+            yield ": keep-alive\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
 @app.route('/download/<path:filename>')
 def download_file(filename: str):
-    """Serve a file from the output directory."""
-    return send_from_directory(OUTPUT_DIR, filename, as_attachment=True)
+    """Serve a file from the output directory.
 
+    Generated names carry a timestamp and are never rewritten, so clients
+    may keep a copy for a while and revalidate with the ETag afterwards.
+    """
+    return send_from_directory(
+        OUTPUT_DIR, filename, as_attachment=True, conditional=True, etag=True, max_age=3600
+    )
 
-@app.route('/view/<path:filename>')
-def view_file(filename: str):
-    """Render an HTML representation of a generated workbook."""
-    file_path = os.path.join(OUTPUT_DIR, filename)
-    if not os.path.exists(file_path) or not filename.lower().endswith('.xlsx'):
-        return abort(404)
-    try:
-        wb = openpyxl.load_workbook(file_path)
-    except Exception as exc:
-        logging.error(f"Error reading '{file_path}': {exc}")
-        return f"Error reading workbook: {exc}", 500
 
-    sheet_tables: List[Dict[str, Any]] = []
-    
-    # Attempt to deduce location from filename for the Title
-    location_title = "Manning Sheets"
-    if "_Ikes_" in filename:
-        location_title = "Manning Sheets - Ikes Dining"
-    elif "_Southside_" in filename:
-        location_title = "Manning Sheets - Southside"
+# Viewer limits: generated charts are a few dozen rows, anything far beyond
+# that is not a chart and is only shown in part (?full=1 raises the row cap)
+VIEW_MAX_ROWS = 500
+VIEW_MAX_ROWS_FULL = 5000
+VIEW_MAX_COLS = 50
 
-    for sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        sheet_data = build_sheet_structure(ws)
-        
-        # Extract metadata from A2 if available
-        header_meta = ws['A2'].value if ws['A2'].value else ""
-        
+
+@functools.lru_cache(maxsize=32)
+def load_sheet_tables(
+    file_path: str, mtime_ns: int, size: int, max_rows: int = VIEW_MAX_ROWS
+) -> Tuple[Tuple[Dict[str, Any], ...], bool]:
+    """Parse a generated workbook into the per-sheet tables the viewer renders.
+
+    ``mtime_ns`` and ``size`` only key the cache: a rewritten file misses,
+    while repeat views (and the print flow's second request) are served
+    from memory. Returns the tables and whether any sheet was cut short.
+    """
+    sheet_tables: List[Dict[str, Any]] = []
+    truncated = False
+    # One extra row and column is read to tell whether the limits were hit
+    for sheet_name, rows in read_xlsx_values(file_path, max_rows + 1, VIEW_MAX_COLS + 1):
+        width = len(rows[0]) if rows else 0
+        if len(rows) > max_rows or width > VIEW_MAX_COLS:
+            logging.warning(
+                f"Truncated view of '{os.path.basename(file_path)}' sheet '{sheet_name}' "
+                f"to {max_rows} rows x {VIEW_MAX_COLS} columns."
+            )
+            truncated = True
+            rows = [row[:VIEW_MAX_COLS] for row in rows[:max_rows]]
+        sheet_data = build_sheet_structure(rows)
         sheet_tables.append(
             {
                 "name": sheet_name,
                 "stations": sheet_data["stations"],
                 "total_entries": sheet_data["total_entries"],
                 "excel_sections": sheet_data["excel_sections"],
-                "header_metadata": header_meta
+                "header_metadata": sheet_data["header_metadata"]
             }
         )
+    return tuple(sheet_tables), truncated
 
-    assets = asset_urls()
-    return render_template_string(
-        """
-<!doctype html>
-<html lang="en">
-<head>
-    <meta charset="utf-8">
-    <title>{{ filename }} - Viewer</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1, shrink-to-fit=no">
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="{{ css_black }}">
-    <link rel="stylesheet" href="{{ css_custom }}">
-    <link rel="stylesheet" href="{{ css_icons }}">
-    <style>{{ base_css }}</style>
-</head>
-<body class="app-shell viewer-shell">
-<div class="app-surface">
-    <!-- Sidebar Navigation (Same as Index) -->
-    <nav class="app-sidebar">
-        <div class="brand">
-            <i class="tim-icons icon-chart-pie-36"></i> ManningGen
-        </div>
-        <p class="muted mb-4">Staffing automation for<br><strong>Ikes/Southside</strong></p>
-        
-        <div class="location-nav">
-             <a href="{{ url_for('index', location='ikes') }}" class="nav-item">
-                <i class="tim-icons icon-istanbul"></i> Ikes Dining
-            </a>
-            <a href="{{ url_for('index', location='southside') }}" class="nav-item">
-                <i class="tim-icons icon-bank"></i> Southside
-            </a>
-        </div>
-        
-        <div class="mt-4 px-2">
-            <a href="{{ url_for('index') }}" class="btn btn-sm btn-simple text-white border-white w-100">
-                <i class="tim-icons icon-minimal-left"></i> Back to Dashboard
-            </a>
-        </div>
-
-        <div class="sidebar-footer mt-auto">
-             <p class="small text-muted text-center">v2.2 Nano Banana</p>
-        </div>
-    </nav>
-
-    <!-- Main Content -->
-    <main class="app-content">
-        <div class="container-fluid p-0">
-             <!-- Viewer Header -->
-             <div class="viewer-actions p-4 mb-4 rounded d-flex justify-content-between align-items-center bg-dark shadow-sm d-print-none">
-                <div class="d-flex align-items-center gap-3">
-                     <div class="icon-shape bg-info text-white rounded-circle shadow-sm d-flex align-items-center justify-content-center flex-shrink-0" style="width: 40px; height: 40px;">
-                        <i class="tim-icons icon-paper"></i>
-                     </div>
-                     <div>
-                         <h4 class="mb-0 text-white">{{ filename }}</h4>
-                         <small class="text-muted">Viewing generated workbook</small>
-                     </div>
-                </div>
-                <div>
-                     <a href="{{ url_for('download_file', filename=filename) }}" class="btn btn-success btn-sm me-2"><i class="tim-icons icon-cloud-download-93"></i> Download</a>
-                     <button onclick="handlePrint()" class="btn btn-warning btn-sm"><i class="tim-icons icon-print"></i> Print All Shifts</button>
-                </div>
-            </div>
-
-            <!-- Tabs -->
-            <div class="viewer-tabs mb-4 text-center d-print-none">
-                {% for table in sheets %}
-                <button class="shift-btn {{ 'active' if loop.first else '' }}" onclick="showSheet('{{ table.name }}', this)">
-                    {{ table.name }}
-                </button>
-                {% endfor %}
-            </div>
-
-            <!-- Sheets -->
-            {% for table in sheets %}
-            <div id="sheet-{{ table.name }}" class="shift-panel {{ 'active' if loop.first else '' }}">
-                <div class="sheet-card">
-                     <!-- Print Header -->
-                     <div class="print-header d-none d-print-block mb-3 text-center border-bottom border-dark pb-2">
-                         <h2 class="mb-1">{{ location_title }}</h2>
-                         <h3 class="mb-1">{{ table.name }}</h3>
-                         <p class="mb-0 text-muted small" style="white-space: pre-wrap;">{{ table.header_metadata }}</p>
-                     </div>
-                     
-                    <div class="excel-view">
-                        <div class="table-responsive">
-                            <table class="excel-table">
-                                {% for block in table.excel_sections %}
-                                    <tr>
-                                        {% for header in block.headers %}
-                                            <th>{{ header }}</th>
-                                        {% endfor %}
-                                    </tr>
-                                    <tr>
-                                        {% for cell in block.cells %}
-                                            <td>{% if cell %}{{ cell.replace('\\n', '<br>')|safe }}{% else %}&nbsp;{% endif %}</td>
-                                        {% endfor %}
-                                    </tr>
-                                {% endfor %}
-                            </table>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            {% endfor %}
-        </div>
-    </main>
-</div>
-
-<script src="{{ js_jquery }}"></script>
-<script src="{{ js_popper }}"></script>
-<script src="{{ js_bootstrap }}"></script>
-<script src="{{ js_black }}"></script>
-<script>
-function showSheet(name, btn) {
-    document.querySelectorAll('.shift-panel').forEach(el => el.classList.remove('active'));
-    document.querySelectorAll('.shift-btn').forEach(el => el.classList.remove('active'));
-    document.getElementById('sheet-' + name).classList.add('active');
-    btn.classList.add('active');
-}
 
-function handlePrint() {
-    // Auto-scale to fit landscape page (approx 1000px safe width)
-    const MAX_WIDTH = 1050; 
-    let maxTableWidth = 0;
-    
-    // Find widest table
-    document.querySelectorAll('.excel-table').forEach(tbl => {
-        if (tbl.offsetWidth > maxTableWidth) maxTableWidth = tbl.offsetWidth;
-    });
-
-    if (maxTableWidth > MAX_WIDTH) {
-        const scale = MAX_WIDTH / maxTableWidth;
-        document.body.style.zoom = scale;
-    } else {
-        document.body.style.zoom = 1;
-    }
+@app.route('/view/<path:filename>')
+def view_file(filename: str):
+    """Render an HTML representation of a generated workbook."""
+    file_path = os.path.join(OUTPUT_DIR, filename)
+    if not filename.lower().endswith('.xlsx'):
+        return abort(404)
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return abort(404)
+    full = request.args.get("full") == "1"
 
-    // Small delay to allow render
-    // Small delay to allow render
-    setTimeout(() => {
-        // Reset zoom after print dialog closes using onafterprint
-        window.onafterprint = function() {
-            document.body.style.zoom = 1;
-        };
-        window.print();
-        
-        // Fallback for browsers that might not fire onafterprint reliably or if blocked
-        window.addEventListener('focus', function() {
-             document.body.style.zoom = 1;
-        }, { once: true });
-    }, 100);
-}
+    # The page is determined by the workbook version and the asset URLs
+    page_key = (filename, stat.st_mtime_ns, stat.st_size, full)
+    etag = hashlib.sha1(repr((page_key, asset_urls())).encode("utf-8")).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = make_response("", 304)
+    else:
+        try:
+            response = make_response(render_view_cached(*page_key))
+        except Exception as exc:
+            logging.error(f"Error reading '{file_path}': {exc}")
+            return f"Error reading workbook: {exc}", 500
+    response.set_etag(etag)
+    response.last_modified = stat.st_mtime
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
-const urlParams = new URLSearchParams(window.location.search);
-if (urlParams.get('print')) {
-    handlePrint();
-}
 
-// Auto-dismiss toasts
-document.addEventListener('DOMContentLoaded', () => {
-    const toasts = document.querySelectorAll('.toast-notification');
-    toasts.forEach(toast => {
-        setTimeout(() => {
-            toast.classList.add('hide');
-            setTimeout(() => toast.remove(), 300);
-        }, 5000); // 5 seconds
-    });
-});
-</script>
-</body>
-</html>
-        """,
+def render_view(filename: str, mtime_ns: int, size: int, full: bool) -> str:
+    """Render the viewer page HTML for one version of a workbook."""
+    file_path = os.path.join(OUTPUT_DIR, filename)
+    max_rows = VIEW_MAX_ROWS_FULL if full else VIEW_MAX_ROWS
+    sheet_tables, truncated = load_sheet_tables(file_path, mtime_ns, size, max_rows)
+
+    # Attempt to deduce location from filename for the Title
+    location_title = "Manning Sheets"
+    if "_Ikes_" in filename:
+        location_title = "Manning Sheets - Ikes Dining"
+    elif "_Southside_" in filename:
+        location_title = "Manning Sheets - Southside"
+
+    assets = asset_urls()
+    return render_template(
+        "view.html",
         filename=filename,
         sheets=sheet_tables,
         location_title=location_title,
-        base_css=BASE_CSS,
+        truncated=truncated,
+        full=full,
         **assets,
     )
 
 
+# A workbook's page only changes when the file does (mtime and size key it)
+render_view_cached = functools.lru_cache(maxsize=16)(render_view)
+
+
+LOG_TAIL_BYTES = 256 * 1024
+
+
 @app.route('/view_log')
 def view_log() -> str:
     """Display the log file in the browser."""
+    return render_template("view_log.html", full=bool(request.args.get("full")))
+
+
+@app.route('/view_log/raw')
+def view_log_raw():
+    """Serve the log file as plain text.
+
+    Only the last LOG_TAIL_BYTES are sent unless ``?full=1`` is given, in
+    which case the whole file is handed off via send_file.
+    """
     try:
-        with open(log_filename, "r", encoding="utf-8") as f:
-            content = f.read()
-    except Exception as exc:
-        content = f"Error reading log: {exc}"
-    return render_template_string(
-        """
-<!doctype html>
-<html>
-<head>
-    <title>System Log</title>
-    <style>body{background:#1e1e2f;color:#e1e4e8;font-family:monospace;padding:20px;white-space:pre-wrap;}</style>
-</head>
-<body>{{ content }}</body>
-</html>
-        """,
-        content=content,
-    )
+        st = os.stat(LOG_FILE)
+    except OSError:
+        return Response("Error reading log: log file not found.", 404, mimetype="text/plain")
+    if request.args.get("full") or st.st_size <= LOG_TAIL_BYTES:
+        return send_file(LOG_FILE, mimetype="text/plain", conditional=True)
+
+    # Map the file and slice out the tail as raw bytes; no decode/re-encode
+    with open(LOG_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = st.st_size - LOG_TAIL_BYTES
+        # Skip the partial line the tail starts in
+        newline = mm.find(b"\n", start)
+        data = mm[newline + 1 if newline != -1 else start:st.st_size]
+    response = Response(data, mimetype="text/plain")
+    response.set_etag(f"tail-{st.st_mtime_ns}-{st.st_size}")
+    response.last_modified = st.st_mtime
+    return response.make_conditional(request)
 
 
 if __name__ == '__main__':
@@ -1188,9 +1560,12 @@ if __name__ == '__main__':
     if len(sys.argv) > 1 and sys.argv[1] == '--no-browser':
         open_browser = False
 
-    # Start the server
+    # Start the server. The socket is bound (and listening) once make_server
+    # returns, so the browser can be opened straight away without a timer.
     port = int(os.environ.get("PORT", 5000))
-    if open_browser:
-        threading.Timer(1.0, lambda: webbrowser.open(f"http://127.0.0.1:{port}")).start()
-    
-    app.run(host='0.0.0.0', port=port)
+    server = make_server('0.0.0.0', port, app, threaded=True)
+    print(f" * Running on http://127.0.0.1:{port}")
+    if open_browser and not os.environ.get("WERKZEUG_RUN_MAIN"):
+        webbrowser.open(f"http://127.0.0.1:{port}")
+
+    server.serve_forever()
@@ -0,0 +1,80 @@
+// Panels are looked up once; switching tabs only touches the old and new pair
+const panels = new Map();
+document.querySelectorAll('.shift-panel').forEach(el => panels.set(el.id.slice('sheet-'.length), el));
+let activePanel = document.querySelector('.shift-panel.active');
+let activeButton = document.querySelector('.shift-btn.active');
+
+function showSheet(name, btn) {
+    const panel = panels.get(name);
+    if (!panel || panel === activePanel) return;
+    if (activePanel) activePanel.classList.remove('active');
+    if (activeButton) activeButton.classList.remove('active');
+    panel.classList.add('active');
+    btn.classList.add('active');
+    activePanel = panel;
+    activeButton = btn;
+}
+
+// One delegated listener handles every tab and print button
+document.addEventListener('click', (event) => {
+    const target = event.target.closest('[data-shift-target], [data-print-target]');
+    if (!target) return;
+    if (target.dataset.shiftTarget !== undefined) {
+        showSheet(target.dataset.shiftTarget, target);
+    } else {
+        handlePrint();
+    }
+});
+
+// Auto-scale to fit landscape page (approx 1000px safe width)
+const PRINT_MAX_WIDTH = 1050;
+// The sheet tables never change after load; query them once
+const excelTables = document.querySelectorAll('.excel-table');
+const printRoot = document.getElementById('print-root');
+
+function resetPrintZoom() {
+    printRoot.style.transform = '';
+    printRoot.style.transformOrigin = '';
+}
+
+// Reset scaling after the print dialog closes
+window.addEventListener('afterprint', resetPrintZoom);
+
+function handlePrint() {
+    // Read every width first, then write styles once
+    let maxTableWidth = 0;
+    excelTables.forEach(tbl => {
+        const width = tbl.getBoundingClientRect().width;
+        if (width > maxTableWidth) maxTableWidth = width;
+    });
+
+    // A transform is composited, so scaling does not re-lay out the tables
+    if (maxTableWidth > PRINT_MAX_WIDTH) {
+        printRoot.style.transformOrigin = '0 0';
+        printRoot.style.transform = `scale(${PRINT_MAX_WIDTH / maxTableWidth})`;
+    }
+
+    // Small delay to allow render
+    setTimeout(() => {
+        window.print();
+        
+        // Fallback for browsers that might not fire afterprint reliably or if blocked
+        window.addEventListener('focus', resetPrintZoom, { once: true });
+    }, 100);
+}
+
+const urlParams = new URLSearchParams(window.location.search);
+if (urlParams.get('print')) {
+    handlePrint();
+}
+
+// Auto-dismiss toasts
+document.addEventListener('DOMContentLoaded', () => {
+    const toasts = document.querySelectorAll('.toast-notification');
+    toasts.forEach(toast => {
+        setTimeout(() => {
+            toast.classList.add('hide');
+            setTimeout(() => toast.remove(), 300);
+        }, 5000); // 5 seconds
+    });
+});
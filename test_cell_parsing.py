@@ -0,0 +1,39 @@
+
+import sys
+import os
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from manning_web_app import scan_cell_assignments
+
+def test_cell_parsing():
+    print("Testing Cell Assignment Parsing...\n")
+
+    cases = [
+        # Description, Cell text, Expected (name, start, end) tuples
+        ("single", "Alice\n\n7:00AM - 3:00PM",
+         [("Alice", "7:00AM", "3:00PM")]),
+        ("crlf", "Alice\r\n\r\n7:00AM - 3:00PM\r\n\r\nBob\r\n\r\n3:00PM - 11:00PM",
+         [("Alice", "7:00AM", "3:00PM"), ("Bob", "3:00PM", "11:00PM")]),
+        ("multi-line name", "Smith,\nJohn\n\n7:00AM - 3:00PM",
+         [("Smith,\nJohn", "7:00AM", "3:00PM")]),
+        ("trailing name", "Alice\n\n7:00AM - 3:00PM\n\nBob",
+         [("Alice", "7:00AM", "3:00PM")]),
+        ("stray line", "Stray\n\nAlice\n\n7:00AM - 3:00PM\n\nBob\n\n3:00PM - 11:00PM",
+         [("Alice", "7:00AM", "3:00PM"), ("Bob", "3:00PM", "11:00PM")]),
+        ("blank name", " \r\n\r\n7:00AM - 3:00PM", []),
+    ]
+
+    passed = 0
+    for desc, text, expected in cases:
+        result = scan_cell_assignments(text)
+        status = "PASS" if result == expected else f"FAIL (Got {result})"
+        print(f"[{desc.upper()}] : {status}")
+        if result == expected:
+            passed += 1
+
+    print(f"\n{passed}/{len(cases)} tests passed.")
+    assert passed == len(cases)
+
+if __name__ == "__main__":
+    test_cell_parsing()